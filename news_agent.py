@@ -16,7 +16,7 @@ delivered via WhatsApp through Twilio.
 To run this script you need to install the following packages:
 
 ```
-pip install feedparser requests beautifulsoup4 schedule pytz twilio openai
+pip install feedparser requests beautifulsoup4 lxml brotli twilio openai
 ```
 
 Before running, set the following environment variables in your shell or in a
@@ -28,51 +28,127 @@ Before running, set the following environment variables in your shell or in a
 * `TWILIO_FROM_NUMBER` – the WhatsApp sending number (e.g. `whatsapp:+14155238886`).
 * `TWILIO_TO_NUMBER` – the destination WhatsApp number that should receive the summary (e.g. `whatsapp:+5511999999999`).
 
-Because running scheduled jobs in long‑running processes can be brittle, you
-should consider configuring a system cron job to invoke this script at
-06:00 every day.  For example, on a Linux system you might add the following
-line to your crontab (edit via `crontab -e`):
+The script runs the job once and exits; it does not stay resident between
+runs.  Schedule it with cron at 06:00 every day.  For example, on a Linux
+system you might add the following lines to your crontab (edit via
+`crontab -e`):
 
 ```
-0 6 * * * /usr/bin/python3 /path/to/news_agent.py >> /var/log/news_agent.log 2>&1
+CRON_TZ=America/Sao_Paulo
+0 6 * * * /usr/bin/python3 /path/to/news_agent.py --send >> /var/log/news_agent.log 2>&1
 ```
 
-Note: This script only prepares the messages when executed by ChatGPT during
-analysis; it will not actually call external APIs.  To activate the WhatsApp
-integration you must supply valid Twilio credentials and set
-``send_message=True`` when calling the script.  When running in production
+On systemd hosts a timer with ``OnCalendar=*-*-* 06:00:00 America/Sao_Paulo``
+and ``Persistent=true`` does the same and catches up on runs missed while the
+machine was off.
+
+Note: Without ``--send`` the script only prepares the messages and logs a
+preview; it will not call Twilio.  To activate the WhatsApp integration you
+must supply valid Twilio credentials and pass ``--send`` (or call
+``daily_job(send_message=True)``).  When running in production
 the environment variables above must be defined and the account must have
 enough quota on both OpenAI and Twilio services.
 """
 
 import os
+import argparse
+import base64
 import datetime
+import functools
+import hashlib
+import html
+import random
+import re
+import threading
 import time
 import logging
+import itertools
+import operator
 import json
-from typing import List, Dict, Optional, Tuple
+import sqlite3
+import unicodedata
+from concurrent.futures import Future, wait
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 
 import feedparser
 import requests
-from bs4 import BeautifulSoup
-import pytz
-import schedule
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 
-try:
-    import openai
-except ImportError:
-    openai = None  # openai is optional during development
+if TYPE_CHECKING:
+    from twilio.rest import Client
 
 try:
-    from twilio.rest import Client
+    import brotli  # noqa: F401  (lets urllib3 decode "br" responses)
 except ImportError:
-    Client = None  # twilio is optional during development
+    brotli = None  # brotli is optional; gzip is used when it is missing
 
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
 
+# A single HTTP session shared by every feed download and the Valor scrape, so
+# TCP/TLS connections are pooled and kept alive instead of being re-opened for
+# each request.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (compatible; news-agent/1.0)",
+        "Accept-Encoding": "gzip, deflate, br" if brotli is not None else "gzip, deflate",
+        "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+    }
+)
+# Transient connection errors and 5xx responses are retried with a short
+# exponential backoff instead of dropping the source for the day.
+_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+
+# (connect, read) timeouts in seconds.  A host that cannot complete the TCP/TLS
+# handshake within two seconds, or stalls for three between bytes, is treated
+# as down for this attempt.
+HTTP_TIMEOUT: Tuple[float, float] = (2, 3)
+# Wall-clock budget for collecting all sources.  Sources still pending when it
+# expires (e.g. a host hanging through every retry) are skipped for the day.
+COLLECT_DEADLINE = 15.0
+
+
+# Relative links are resolved against the site root; anything else (mailto:,
+# javascript:, fragments) is skipped.
+_VALOR_LINK_PREFIXES = ("/", "http")
+# Headlines have at least three words; navigation labels usually do not.
+_THREE_WORDS_RE = re.compile(r"\S+\s+\S+\s+\S")
+# Only headline-like tags that carry a usable link are of interest when
+# scraping Valor; restricting the parser to them avoids building the rest of
+# the DOM, and the href test runs before any tag object is created.
+_VALOR_STRAINER = SoupStrainer(
+    ["h2", "h3", "a"],
+    href=lambda href: bool(href) and href.startswith(_VALOR_LINK_PREFIXES),
+)
+
+
+# All dates in messages and the "published today" filter use São Paulo time.
+# The tzinfo is resolved once at import instead of on every call.
+LOCAL_TZ_NAME = "America/Sao_Paulo"
+_LOCAL_TZ = ZoneInfo(LOCAL_TZ_NAME)
+
+
+def _get_tz(tz: str) -> datetime.tzinfo:
+    """Return the tzinfo for ``tz``, reusing the module default when it matches."""
+    return _LOCAL_TZ if tz == LOCAL_TZ_NAME else ZoneInfo(tz)
+
+
+# Directory holding ETag/Last-Modified validators and bodies of previously
+# fetched pages, so unchanged feeds can be answered with a 304.
+CACHE_DIR = os.path.expanduser(os.getenv("NEWS_AGENT_CACHE_DIR", "~/.cache/news_agent"))
+# Links delivered in earlier runs are remembered for this many days so that
+# stories lingering on a feed are not sent again.
+SENT_RETENTION_DAYS = 7
+
+
 # Define the RSS feed URLs for economy and politics sections of each news source.
 # These URLs were compiled in August 2025; some feeds may occasionally be unavailable
 # but the agent will skip any that fail to parse.  The keys combine the
@@ -97,13 +173,143 @@ RSS_FEEDS: dict[str, str] = {
     "WSJ_Politica": "https://feeds.a.dj.com/rss/RSSPoliticsAndPolicy.xml",
 }
 
+# Message category for each topic suffix used in the RSS_FEEDS keys.
+_TOPIC_CATEGORY: dict[str, str] = {
+    "economia": "Economia",
+    "business": "Economia",
+    "politica": "Politica",
+    "politics": "Politica",
+    "policy": "Politica",
+}
+# Category of every known source, resolved once at import so that
+# categorize_articles is a plain dictionary lookup per article.
+FEED_CATEGORY: dict[str, str] = {
+    name: _TOPIC_CATEGORY.get(name.rsplit("_", 1)[-1].lower(), "Outros")
+    for name in RSS_FEEDS
+    if "_" in name
+}
+FEED_CATEGORY["Valor"] = "Economia"
+
+
+def _cache_path(key: str) -> str:
+    """Return the on-disk cache file used for ``key`` (usually a URL)."""
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
 
-def get_rss_articles(feed_name: str, feed_url: str, max_entries: int = 5) -> List[Dict[str, str]]:
-    """Parse a single RSS feed and return the most recent articles.
+
+def _load_cache_entry(key: str) -> Dict[str, str]:
+    """Read the cache entry stored for ``key`` (empty if absent)."""
+    try:
+        with open(_cache_path(key), "rb") as fh:
+            data = fh.read()
+        return json.loads(data)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_cache_entry(key: str, entry: Dict[str, str]) -> None:
+    """Persist ``entry`` for ``key``; failures only cost the next revalidation."""
+    path = _cache_path(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        data = json.dumps(entry).encode("utf-8")
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logging.warning(f"Could not write HTTP cache for {key}: {exc}")
+
+
+def _conditional_get(url: str, timeout: Union[float, Tuple[float, float]] = HTTP_TIMEOUT) -> bytes:
+    """GET ``url`` through the shared session, revalidating a cached copy.
+
+    When a previous response carried an ``ETag`` or ``Last-Modified`` header,
+    those validators are sent back as ``If-None-Match``/``If-Modified-Since``.
+    A ``304 Not Modified`` answer then returns the cached body without
+    transferring it again.
+
+    Args:
+        url: The URL to fetch.
+        timeout: Request timeout in seconds, or a (connect, read) tuple.
+
+    Returns:
+        The undecoded response body.
+    """
+    entry = _load_cache_entry(url)
+    headers: Dict[str, str] = {}
+    if "body" in entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    response = _SESSION.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and headers:
+        logging.debug(f"{url} not modified; using cached copy")
+        return base64.b64decode(entry["body"])
+    response.raise_for_status()
+    body = response.content
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _store_cache_entry(
+            url,
+            {
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+                "body": base64.b64encode(body).decode("ascii"),
+            },
+        )
+    return body
+
+
+def _load_cached_articles(feed_url: str, body_sha1: str, max_entries: int) -> Optional[List[Dict[str, str]]]:
+    """Return the articles previously parsed from this exact body, if any."""
+    entry = _load_cache_entry(f"articles:{feed_url}")
+    if entry.get("body_sha1") != body_sha1 or entry.get("max_entries", 0) < max_entries:
+        return None
+    articles = entry["articles"][:max_entries]
+    for art in articles:
+        if art["published"]:
+            art["published"] = datetime.datetime.fromisoformat(art["published"])
+    return articles
+
+
+def _store_cached_articles(
+    feed_url: str, body_sha1: str, articles: List[Dict[str, str]], max_entries: int
+) -> None:
+    """Remember the articles parsed from the body of ``feed_url`` with ``body_sha1``."""
+    serialisable = [
+        dict(art, published=art["published"].isoformat() if art["published"] else None)
+        for art in articles
+    ]
+    _store_cache_entry(
+        f"articles:{feed_url}",
+        {"body_sha1": body_sha1, "max_entries": max_entries, "articles": serialisable},
+    )
+
+
+def fetch_feed(feed_url: str, timeout: Union[float, Tuple[float, float]] = HTTP_TIMEOUT) -> bytes:
+    """Download the raw body of an RSS feed.
+
+    Fetching is kept separate from parsing so that several feeds can be
+    downloaded concurrently (see ``collect_today_news``).
 
     Args:
-        feed_name: Friendly name of the feed (used to tag the article source).
         feed_url: The URL of the RSS feed.
+        timeout: Request timeout in seconds, or a (connect, read) tuple.
+
+    Returns:
+        The undecoded response body.
+    """
+    return _conditional_get(feed_url, timeout=timeout)
+
+
+def parse_feed_entries(feed_name: str, raw: bytes, max_entries: int = 5) -> List[Dict[str, str]]:
+    """Parse a downloaded RSS feed and return the most recent articles.
+
+    Args:
+        feed_name: Friendly name of the feed (used to tag the article source).
+        raw: The feed body as returned by ``fetch_feed``.
         max_entries: Maximum number of entries to return.
 
     Returns:
@@ -111,15 +317,18 @@ def get_rss_articles(feed_name: str, feed_url: str, max_entries: int = 5) -> Lis
         (timezone aware), summary and source.
     """
     articles: List[Dict[str, str]] = []
-    logging.debug(f"Fetching RSS feed for {feed_name} from {feed_url}")
-    parsed = feedparser.parse(feed_url)
+    # Summaries are stripped to plain text downstream (including the script
+    # and style blocks feedparser's sanitiser would drop), so its own HTML
+    # sanitising and relative-URI rewriting would be wasted work.
+    parsed = feedparser.parse(raw, resolve_relative_uris=False, sanitize_html=False)
     for entry in parsed.entries[:max_entries]:
         title = entry.get("title", "")
         link = entry.get("link", "")
         summary = entry.get("summary", "") or entry.get("description", "")
         published: Optional[datetime.datetime] = None
         if "published_parsed" in entry and entry.published_parsed:
-            published = datetime.datetime.fromtimestamp(time.mktime(entry.published_parsed), pytz.utc)
+            # feedparser normalises dates to a UTC struct_time.
+            published = datetime.datetime(*entry.published_parsed[:6], tzinfo=datetime.timezone.utc)
         articles.append(
             {
                 "title": title,
@@ -132,6 +341,46 @@ def get_rss_articles(feed_name: str, feed_url: str, max_entries: int = 5) -> Lis
     return articles
 
 
+def get_rss_articles(feed_name: str, feed_url: str, max_entries: int = 5) -> List[Dict[str, str]]:
+    """Fetch and parse a single RSS feed and return the most recent articles.
+
+    Args:
+        feed_name: Friendly name of the feed (used to tag the article source).
+        feed_url: The URL of the RSS feed.
+        max_entries: Maximum number of entries to return.
+
+    Returns:
+        A list of dictionaries containing title, link, published datetime
+        (timezone aware), summary and source.
+    """
+    logging.debug(f"Fetching RSS feed for {feed_name} from {feed_url}")
+    raw = fetch_feed(feed_url)
+    body_sha1 = hashlib.sha1(raw).hexdigest()
+    # Across runs, the body is identical either because the server answered
+    # 304 or because it resent unchanged bytes without validators; in both
+    # cases the entries are too, so reuse them and skip the XML parse.
+    cached = _load_cached_articles(feed_url, body_sha1, max_entries)
+    if cached is not None:
+        for art in cached:
+            art["source"] = feed_name
+        return cached
+    articles = parse_feed_entries(feed_name, raw, max_entries)
+    _store_cached_articles(feed_url, body_sha1, articles, max_entries)
+    return articles
+
+
+def _title_key(text: str) -> str:
+    """Normalise a headline for duplicate detection.
+
+    Case, accents, runs of whitespace and trailing punctuation are ignored so
+    that variants such as "Açúcar sobe" and "acucar sobe." collapse to the
+    same key.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split()).rstrip(".!?…:; ")
+
+
 def scrape_valor_headlines(base_url: str = "https://valorinternational.globo.com", max_articles: int = 5) -> List[Dict[str, str]]:
     """Scrape the top headlines from Valor International's home page.
 
@@ -149,30 +398,36 @@ def scrape_valor_headlines(base_url: str = "https://valorinternational.globo.com
     """
     logging.debug(f"Scraping Valor International headlines from {base_url}")
     try:
-        response = requests.get(base_url, timeout=10)
-        response.raise_for_status()
+        raw = _conditional_get(base_url)
     except Exception as e:
         logging.error(f"Failed to fetch Valor International homepage: {e}")
         return []
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Hand the raw bytes to lxml so decoding happens in C; Valor serves UTF-8,
+    # so naming the encoding up front skips charset sniffing.
+    soup = BeautifulSoup(raw, "lxml", from_encoding="utf-8", parse_only=_VALOR_STRAINER)
     headlines: List[Dict[str, str]] = []
     seen_titles: set[str] = set()
+    # Homepages often link the same story several times (teaser, image,
+    # headline); links are deduplicated in the same pass as the titles.
+    seen_links: set[str] = set()
+    site_root = base_url.rstrip('/')
     for tag in soup.find_all(['h2', 'h3', 'a']):
-        text = tag.get_text(strip=True)
         href = tag.get('href')
-        if not text or not href:
+        if not href:
+            continue
+        link = site_root + href if href[0] == '/' else href
+        if link in seen_links:
             continue
-        if len(text.split()) < 3:
+        text = tag.get_text(strip=True)
+        if not text:
             continue
-        if text in seen_titles:
+        if _THREE_WORDS_RE.search(text) is None:
             continue
-        seen_titles.add(text)
-        if href.startswith('/'):
-            link = base_url.rstrip('/') + href
-        elif href.startswith('http'):
-            link = href
-        else:
+        key = _title_key(text)
+        if key in seen_titles:
             continue
+        seen_titles.add(key)
+        seen_links.add(link)
         headlines.append(
             {
                 "title": text,
@@ -187,32 +442,136 @@ def scrape_valor_headlines(base_url: str = "https://valorinternational.globo.com
     return headlines
 
 
-def filter_today_articles(articles: List[Dict[str, str]], tz: str = "America/Sao_Paulo") -> List[Dict[str, str]]:
+def filter_today_articles(
+    articles: List[Dict[str, str]],
+    tz: str = LOCAL_TZ_NAME,
+    today: Optional[datetime.date] = None,
+) -> List[Dict[str, str]]:
     """Filter a list of articles to include only those published today.
 
     Args:
         articles: List of article dictionaries with a timezone‑aware 'published'.
         tz: IANA timezone string for the user's local time.
+        today: Date to filter on; defaults to the current date in ``tz``.
 
     Returns:
         Filtered list containing only articles with a published date equal to
         today's date in the specified timezone.  Articles without a date
         (e.g., scraped from Valor) are included by default.
     """
-    local_tz = pytz.timezone(tz)
-    today = datetime.datetime.now(local_tz).date()
+    local_tz = _get_tz(tz)
+    if today is None:
+        today = datetime.datetime.now(local_tz).date()
+    # Convert "today" into a [start, end) window of POSIX timestamps once, so
+    # each article costs a single float comparison instead of a timezone
+    # conversion.  Both bounds are resolved separately to stay correct on
+    # days with a DST transition.
+    day_start = datetime.datetime.combine(today, datetime.time.min, tzinfo=local_tz).timestamp()
+    day_end = datetime.datetime.combine(
+        today + datetime.timedelta(days=1), datetime.time.min, tzinfo=local_tz
+    ).timestamp()
     filtered: List[Dict[str, str]] = []
     for art in articles:
         published = art.get("published")
-        if published is None:
-            filtered.append(art)
-            continue
-        local_published = published.astimezone(local_tz)
-        if local_published.date() == today:
+        if published is None or day_start <= published.timestamp() < day_end:
             filtered.append(art)
     return filtered
 
 
+# RSS summaries are short fragments whose structure is irrelevant, so tags are
+# dropped with a regular expression rather than by building a parse tree.
+# Only a "<" that opens a tag, end tag, comment/doctype or processing
+# instruction counts, so text such as "Selic < 10% e IPCA > 5%" survives.
+_TAG_RE = re.compile(r"<(?:/?[A-Za-z]|[!?])[^>]*>")
+# Script and style blocks carry code, not text, and go together with their
+# contents; a block left open by truncation runs to the end of the fragment.
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|applet)\b.*?(?:</\1\s*>|$)", re.IGNORECASE | re.DOTALL)
+_WS_RE = re.compile(r"\s+")
+# A tag cut in half by truncation has no closing ">" for _TAG_RE to match.
+_PARTIAL_TAG_RE = re.compile(r"<(?:/?[A-Za-z]|[!?])[^>]*$")
+# Only the opening of a summary ever reaches a message (about one sentence),
+# so the visible text is cut to this many characters.
+_SUMMARY_SCAN_CHARS = 400
+# Raw summaries are bounded before tag stripping.  The bound is generous so
+# that heavy leading markup (inline styles, long image URLs) cannot use up
+# the room meant for the text itself.
+_SUMMARY_MAX_HTML = 8000
+
+
+def _strip_html(fragment: str) -> str:
+    """Return the visible text of an RSS summary fragment.
+
+    Script and style blocks are removed with their contents, other tags are
+    removed and HTML entities decoded.  Many feeds ship plain-text summaries,
+    which are returned untouched.
+    """
+    if "<" not in fragment and "&" not in fragment:
+        return fragment
+    if "<" in fragment:
+        fragment = _TAG_RE.sub("", _SCRIPT_STYLE_RE.sub("", fragment))
+    return html.unescape(fragment)
+
+
+def _summary_text(summary: str) -> Tuple[str, bool]:
+    """Return the visible, whitespace-collapsed text at the start of ``summary``.
+
+    At most ``_SUMMARY_MAX_HTML`` characters of markup are examined and at
+    most ``_SUMMARY_SCAN_CHARS`` characters of text are returned.
+
+    Returns:
+        The text and whether the summary was cut short to produce it.
+    """
+    clipped = len(summary) > _SUMMARY_MAX_HTML
+    if clipped:
+        summary = _PARTIAL_TAG_RE.sub("", summary[:_SUMMARY_MAX_HTML])
+    text = _WS_RE.sub(" ", _strip_html(summary)).strip()
+    if len(text) > _SUMMARY_SCAN_CHARS:
+        return text[:_SUMMARY_SCAN_CHARS], True
+    return text, clipped
+
+
+def _call_with_backoff(func, retry_on: Tuple[type, ...], attempts: int = 3, base_delay: float = 0.5):
+    """Call ``func`` and retry transient failures with jittered exponential backoff.
+
+    The delay doubles after each failed attempt (0.5 s, 1 s, ...) plus a random
+    amount of up to the same length, so concurrent callers do not retry in
+    lockstep.
+
+    Args:
+        func: Zero-argument callable to invoke.
+        retry_on: Exception types that are worth retrying.
+        attempts: Total number of attempts, including the first one.
+        base_delay: Delay in seconds before the first retry.
+
+    Returns:
+        Whatever ``func`` returns.
+
+    Raises:
+        Exception: The last error once all attempts have failed, or any
+            error not listed in ``retry_on``.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except retry_on as exc:
+            if attempt == attempts:
+                raise
+            delay = base_delay * 2 ** (attempt - 1)
+            delay += random.uniform(0, delay)
+            logging.warning(
+                f"Attempt {attempt}/{attempts} failed ({exc}); retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+# Prompt size limits for the OpenAI request.  RSS summaries put the key facts
+# first, so each one is cut to a short lede; the total cap (roughly 3,500
+# tokens of Portuguese text) drops the last articles rather than letting a
+# long day blow up the request.
+_PROMPT_SUMMARY_CHARS = 300
+_PROMPT_MAX_CHARS = 12000
+
+
 def summarise_with_chatgpt(articles: List[Dict[str, str]], language: str = "pt") -> str:
     """Use the OpenAI Chat Completion API to produce a concise summary of articles.
 
@@ -228,7 +587,11 @@ def summarise_with_chatgpt(articles: List[Dict[str, str]], language: str = "pt")
     Returns:
         A string containing the combined summary.
     """
-    if openai is None:
+    # openai is optional and slow to import, so it is only loaded when a
+    # summary is actually requested.
+    try:
+        import openai
+    except ImportError:
         raise RuntimeError("openai module not installed. Run 'pip install openai'.")
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -242,6 +605,7 @@ def summarise_with_chatgpt(articles: List[Dict[str, str]], language: str = "pt")
     )
     messages.append({"role": "system", "content": system_prompt})
     user_content_lines = []
+    prompt_chars = 0
     for i, art in enumerate(articles, start=1):
         # Include the source (feed name) to help the model understand the topic and
         # provenance of each article.  Many feeds encode the topic in the key
@@ -249,29 +613,58 @@ def summarise_with_chatgpt(articles: List[Dict[str, str]], language: str = "pt")
         # summarisation in distinguishing economy and politics stories.
         line = f"{i}. Título: {art['title']}\n"
         if art.get("summary"):
-            summary_text = BeautifulSoup(art['summary'], "html.parser").get_text()
+            summary_text, clipped = _summary_text(art['summary'])
+            if len(summary_text) > _PROMPT_SUMMARY_CHARS:
+                summary_text = summary_text[:_PROMPT_SUMMARY_CHARS].rsplit(' ', 1)[0] + '…'
+            elif clipped:
+                summary_text = summary_text.rsplit(' ', 1)[0] + '…'
             line += f"Resumo: {summary_text}\n"
         line += f"Fonte: {art.get('source', '')}\n"
         line += f"Link: {art['link']}"
+        prompt_chars += len(line) + 2
+        if prompt_chars > _PROMPT_MAX_CHARS:
+            logging.warning(f"Prompt size limit reached; leaving out {len(articles) - i + 1} article(s).")
+            break
         user_content_lines.append(line)
     user_content = "\n\n".join(user_content_lines)
     messages.append({"role": "user", "content": user_content})
     logging.debug("Sending summarisation request to OpenAI")
-    response = openai.ChatCompletion.create(
-        model="gpt-3.5-turbo",
-        messages=messages,
-        temperature=0.3,
-        max_tokens=800,
+
+    def request_summary() -> str:
+        # All articles go out in one request; streaming lets the reply be
+        # consumed as it is generated instead of waiting for the full completion.
+        stream = openai.ChatCompletion.create(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            temperature=0.3,
+            max_tokens=800,
+            stream=True,
+        )
+        parts: List[str] = []
+        for chunk in stream:
+            content = chunk.choices[0].delta.get("content")
+            if content:
+                parts.append(content)
+        return "".join(parts)
+
+    # Rate limits and dropped connections are usually gone a second later;
+    # a failure mid-stream restarts the whole request.
+    transient_errors = (
+        openai.error.RateLimitError,
+        openai.error.APIConnectionError,
+        openai.error.Timeout,
+        openai.error.ServiceUnavailableError,
     )
-    summary = response.choices[0].message["content"].strip()
+    summary = _call_with_backoff(request_summary, transient_errors).strip()
     return summary
 
 
 def prepare_news_message(
     articles: List[Dict[str, str]],
-    tz: str = "America/Sao_Paulo",
+    tz: str = LOCAL_TZ_NAME,
     max_articles: int = 10,
     max_chars: int = 1500,
+    today_str: Optional[str] = None,
 ) -> str:
     """Build a detailed WhatsApp message with a small summary for each article.
 
@@ -284,13 +677,14 @@ def prepare_news_message(
         articles: List of article dictionaries with keys 'title', 'summary',
             'link' and 'source'.
         tz: IANA timezone string for date formatting.
+        today_str: Date shown in the header; defaults to today in ``tz``.
 
     Returns:
         A string suitable for sending via WhatsApp.
     """
     # Determine the current date in the requested timezone.
-    local_tz = pytz.timezone(tz)
-    today_str = datetime.datetime.now(local_tz).strftime("%d/%m/%Y")
+    if today_str is None:
+        today_str = datetime.datetime.now(_get_tz(tz)).strftime("%d/%m/%Y")
     lines: List[str] = []
     # Header for the message
     header = f"Principais notícias de {today_str} (Economia & Política):"
@@ -302,35 +696,41 @@ def prepare_news_message(
         if count >= max_articles:
             break
         title = art.get("title", "").strip()
-        summary_html = art.get("summary", "") or ""
-        # Strip HTML tags from RSS summaries
-        summary_text = BeautifulSoup(summary_html, "html.parser").get_text().strip()
+        source = art.get("source", "")
+        link = art.get("link", "")
+        # Build the fixed fragments of the line first.  A summary can only make
+        # the line longer, so if these alone no longer fit there is no point in
+        # cleaning up the summary at all.
+        head = f"{idx}. {title}"
+        tail = ""
+        if source:
+            tail += f" (Fonte: {source})"
+        if link:
+            tail += f"\nLink: {link}"
+        if current_length + len(head) + len(tail) + 2 > max_chars:
+            break
+        # Strip HTML tags from RSS summaries and collapse whitespace
+        summary_text, clipped = _summary_text(art.get("summary", "") or "")
         # Truncate summaries aggressively to around 150 characters
         truncated = ""
         if summary_text:
-            # Remove excess whitespace
-            truncated = ' '.join(summary_text.split())
-            # Try to cut at the first sentence or to 150 chars
-            sentences = truncated.split('.')
-            if sentences:
-                first_sentence = sentences[0].strip()
-                if len(first_sentence) <= 150:
-                    truncated = first_sentence
-                else:
-                    truncated = first_sentence[:150].rsplit(' ', 1)[0] + '…'
+            # Try to cut at the first sentence or to 150 chars; locate the
+            # first full stop instead of splitting the whole summary.
+            dot = summary_text.find('.')
+            first_sentence = (summary_text[:dot] if dot != -1 else summary_text).strip()
+            if len(first_sentence) > 150:
+                truncated = first_sentence[:150].rsplit(' ', 1)[0] + '…'
+            elif dot == -1 and clipped:
+                # The scan limit ended mid-sentence (and possibly mid-word).
+                truncated = first_sentence.rsplit(' ', 1)[0] + '…'
             else:
-                if len(truncated) > 150:
-                    truncated = truncated[:150].rsplit(' ', 1)[0] + '…'
-        source = art.get("source", "")
-        link = art.get("link", "")
-        # Construct the message line
-        line = f"{idx}. {title}"
+                truncated = first_sentence
+        # Construct the message line from its fragments in a single join
+        parts = [head]
         if truncated:
-            line += f" – {truncated}"
-        if source:
-            line += f" (Fonte: {source})"
-        if link:
-            line += f"\nLink: {link}"
+            parts.append(f" – {truncated}")
+        parts.append(tail)
+        line = "".join(parts)
         # Check if adding this line would exceed the character limit
         tentative_length = current_length + len(line) + 2  # plus separators
         if tentative_length > max_chars:
@@ -347,9 +747,9 @@ def categorize_articles(articles: List[Dict[str, str]]) -> Dict[str, List[Dict[s
 
     The source strings in RSS_FEEDS are formatted as ``<Publication>_<Topic>`` where
     the topic is either ``Economia`` (for economy/business) or ``Politica`` (for
-    politics).  This helper inspects the suffix of the source key to group
-    articles accordingly.  Any article whose source is missing or does not
-    explicitly end with a recognised category is placed into the ``Outros`` group.
+    politics).  The category of each source is looked up in ``FEED_CATEGORY``,
+    which also files the Valor scrape under ``Economia``.  Any article whose
+    source is missing or unknown is placed into the ``Outros`` group.
 
     Args:
         articles: List of article dictionaries.
@@ -364,26 +764,28 @@ def categorize_articles(articles: List[Dict[str, str]]) -> Dict[str, List[Dict[s
         "Outros": [],
     }
     for art in articles:
-        source = art.get("source", "")
-        # Determine the topic from the portion after the last underscore
-        if source and "_" in source:
-            topic_key = source.split("_")[-1].lower()
-            if topic_key in ("economia", "business"):
-                categories["Economia"].append(art)
-                continue
-            if topic_key in ("politica", "politics", "policy"):
-                categories["Politica"].append(art)
-                continue
-        # Anything else goes into 'Outros'
-        categories["Outros"].append(art)
+        categories[FEED_CATEGORY.get(art.get("source", ""), "Outros")].append(art)
     return categories
 
 
+def _format_headline(idx: int, art: Dict[str, str]) -> str:
+    """Render one numbered headline line, including source for context."""
+    line = f"{idx}. {art.get('title', '').strip()}"
+    source = art.get("source", "")
+    link = art.get("link", "")
+    if source:
+        line += f" (Fonte: {source})"
+    if link:
+        line += f"\nLink: {link}"
+    return line
+
+
 def build_headline_message(
     category: str,
     articles: List[Dict[str, str]],
-    tz: str = "America/Sao_Paulo",
+    tz: str = LOCAL_TZ_NAME,
     max_articles: int = 5,
+    today_str: Optional[str] = None,
 ) -> str:
     """Construct a brief WhatsApp message listing only the main headlines for a category.
 
@@ -398,35 +800,105 @@ def build_headline_message(
         articles: List of article dictionaries to include.
         tz: IANA timezone string for date formatting.
         max_articles: Maximum number of headlines to include.
+        today_str: Date shown in the header; defaults to today in ``tz``.
 
     Returns:
         A string containing the category header followed by enumerated headlines.
     """
-    local_tz = pytz.timezone(tz)
-    today_str = datetime.datetime.now(local_tz).strftime("%d/%m/%Y")
+    if today_str is None:
+        today_str = datetime.datetime.now(_get_tz(tz)).strftime("%d/%m/%Y")
     header = f"Principais manchetes de {category} em {today_str}:"
-    lines = [header]
-    # Take only the first ``max_articles`` headlines
-    for idx, art in enumerate(articles[:max_articles], start=1):
-        title = art.get("title", "").strip()
-        source = art.get("source", "")
-        link = art.get("link", "")
-        # Build the headline line; include source for context
-        line = f"{idx}. {title}"
-        if source:
-            line += f" (Fonte: {source})"
-        if link:
-            line += f"\nLink: {link}"
-        lines.append(line)
-    return "\n\n".join(lines)
+    # Take only the first ``max_articles`` headlines and stream them straight
+    # into the join instead of collecting an intermediate list.
+    headlines = (
+        _format_headline(idx, art)
+        for idx, art in enumerate(itertools.islice(articles, max_articles), start=1)
+    )
+    return "\n\n".join(itertools.chain((header,), headlines))
+
+
+# Twilio rejects WhatsApp bodies longer than 1600 characters; keep some margin.
+WHATSAPP_MAX_CHARS = 1500
+
+
+def _split_lines(message: str, limit: int) -> List[str]:
+    """Split a message on line boundaries into chunks of at most ``limit`` chars.
+
+    Lines longer than ``limit`` on their own are cut into ``limit``-sized
+    pieces.  Empty chunks are never produced.
+    """
+    chunks: List[str] = []
+    current = ""
+    for line in message.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            candidate = line
+        current = candidate
+    if current.strip():
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _split_message(message: str, limit: int = WHATSAPP_MAX_CHARS) -> List[str]:
+    """Split a message into chunks of at most ``limit`` chars.
+
+    Chunks end at blank lines where possible, so a headline stays together
+    with its source and link.  Blocks longer than ``limit`` on their own are
+    split on line boundaries instead.  Empty chunks are never produced.
+    """
+    chunks: List[str] = []
+    current = ""
+    for block in message.split("\n\n"):
+        pieces = [block] if len(block) <= limit else _split_lines(block, limit)
+        for piece in pieces:
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if len(candidate) > limit:
+                chunks.append(current)
+                candidate = piece
+            current = candidate
+    if current.strip():
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_twilio_client() -> "Client":
+    """Return a Twilio client built once per process.
+
+    Reusing the client keeps its HTTP connection pool alive between sends
+    instead of paying SDK setup and a TLS handshake on every message.  Errors
+    are not cached, so a later call can succeed once the environment is fixed.
+
+    Raises:
+        RuntimeError: If the twilio package is not installed.
+        EnvironmentError: If the Twilio credentials are missing.
+    """
+    # twilio is optional and only imported when a message is actually sent.
+    try:
+        from twilio.rest import Client
+    except ImportError:
+        raise RuntimeError("twilio module not installed. Run 'pip install twilio'.")
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    if not all([account_sid, auth_token]):
+        raise EnvironmentError("Missing one or more Twilio environment variables.")
+    return Client(account_sid, auth_token)
 
 
 def send_whatsapp_message(message: str) -> None:
     """Send a WhatsApp message using Twilio's API.
 
     This function reads Twilio credentials from environment variables and
-    dispatches a single text message.  Messages are sent via the Twilio
-    Sandbox or a verified WhatsApp business number.
+    dispatches a text message.  Messages longer than ``WHATSAPP_MAX_CHARS``
+    are split on line boundaries and sent as consecutive parts.  Messages are
+    sent via the Twilio Sandbox or a verified WhatsApp business number.
 
     Args:
         message: The text to send.
@@ -434,21 +906,21 @@ def send_whatsapp_message(message: str) -> None:
     Raises:
         EnvironmentError: If required environment variables are missing.
     """
-    if Client is None:
-        raise RuntimeError("twilio module not installed. Run 'pip install twilio'.")
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
     from_number = os.getenv("TWILIO_FROM_NUMBER")
     to_number = os.getenv("TWILIO_TO_NUMBER")
-    if not all([account_sid, auth_token, from_number, to_number]):
+    if not all([from_number, to_number]):
         raise EnvironmentError("Missing one or more Twilio environment variables.")
-    client = Client(account_sid, auth_token)
-    logging.info("Sending WhatsApp message...")
-    client.messages.create(
-        body=message,
-        from_=from_number,
-        to=to_number,
-    )
+    client = _get_twilio_client()
+    chunks = _split_message(message)
+    logging.info(f"Sending WhatsApp message in {len(chunks)} part(s)...")
+    # The cached client keeps its connection open, so the parts go out back to
+    # back over the same session.
+    for chunk in chunks:
+        client.messages.create(
+            body=chunk,
+            from_=from_number,
+            to=to_number,
+        )
     logging.info("WhatsApp message sent successfully.")
 
 
@@ -473,15 +945,11 @@ def send_template_message(
     Raises:
         EnvironmentError: If required environment variables are missing.
     """
-    if Client is None:
-        raise RuntimeError("twilio module not installed. Run 'pip install twilio'.")
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
     from_number = os.getenv("TWILIO_FROM_NUMBER")
     to_number = os.getenv("TWILIO_TO_NUMBER")
-    if not all([account_sid, auth_token, from_number, to_number, content_sid]):
+    if not all([from_number, to_number, content_sid]):
         raise EnvironmentError("Missing one or more Twilio environment variables or content SID.")
-    client = Client(account_sid, auth_token)
+    client = _get_twilio_client()
     logging.info("Sending WhatsApp template message...")
     # Twilio's Content API expects content variables to be JSON-encoded.
     client.messages.create(
@@ -493,26 +961,181 @@ def send_template_message(
     logging.info("WhatsApp template message sent successfully.")
 
 
-def collect_today_news() -> List[Dict[str, str]]:
+@functools.lru_cache(maxsize=1)
+def _get_sent_db() -> sqlite3.Connection:
+    """Return the connection to the database of already-sent links.
+
+    Raises:
+        OSError: If the cache directory cannot be created.
+        sqlite3.Error: If the database cannot be opened.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, "sent.db"))
+    conn.execute("CREATE TABLE IF NOT EXISTS sent (link_hash TEXT PRIMARY KEY, sent_at TEXT NOT NULL)")
+    return conn
+
+
+def _link_hash(link: str) -> str:
+    """Return the fixed-size key under which ``link`` is stored in the sent database."""
+    return hashlib.blake2b(link.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _drop_already_sent(articles: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Remove articles whose link was delivered by an earlier run.
+
+    Articles without a link are kept.  If the database is unavailable the
+    list is returned unchanged.
+    """
+    hashes = {art["link"]: _link_hash(art["link"]) for art in articles if art.get("link")}
+    if not hashes:
+        return articles
+    try:
+        conn = _get_sent_db()
+        placeholders = ",".join("?" * len(hashes))
+        rows = conn.execute(
+            f"SELECT link_hash FROM sent WHERE link_hash IN ({placeholders})",
+            list(hashes.values()),
+        ).fetchall()
+    except (OSError, sqlite3.Error) as exc:
+        logging.warning(f"Could not read sent-links database: {exc}")
+        return articles
+    sent = {row[0] for row in rows}
+    if sent:
+        logging.info(f"Skipping {len(sent)} article(s) already sent in earlier runs.")
+    return [art for art in articles if not art.get("link") or hashes[art["link"]] not in sent]
+
+
+def _record_sent(articles: List[Dict[str, str]], today: datetime.date) -> None:
+    """Remember the links of delivered articles and forget expired ones."""
+    cutoff = (today - datetime.timedelta(days=SENT_RETENTION_DAYS)).isoformat()
+    rows = [(_link_hash(art["link"]), today.isoformat()) for art in articles if art.get("link")]
+    try:
+        conn = _get_sent_db()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO sent (link_hash, sent_at) VALUES (?, ?)", rows)
+            conn.execute("DELETE FROM sent WHERE sent_at < ?", (cutoff,))
+    except (OSError, sqlite3.Error) as exc:
+        logging.warning(f"Could not update sent-links database: {exc}")
+
+
+def _run_in_daemon_thread(func, *args) -> Future:
+    """Run ``func(*args)`` on a daemon thread and return a future for its result.
+
+    Unlike ThreadPoolExecutor workers, which are joined at interpreter exit,
+    a daemon thread that is still blocked on a slow host does not keep the
+    process alive once the job has finished.
+    """
+    future: Future = Future()
+
+    def runner() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=runner, daemon=True).start()
+    return future
+
+
+def collect_today_news(today: Optional[datetime.date] = None) -> List[Dict[str, str]]:
     """Aggregate today's articles from all configured feeds and Valor.
 
+    Args:
+        today: Date to collect articles for; defaults to today in São Paulo.
+
     Returns:
-        A list of article dictionaries filtered for the current date.
+        A list of article dictionaries filtered for the current date, without
+        repeated headlines or links already sent by an earlier run.
     """
     all_articles: List[Dict[str, str]] = []
-    for feed_name, feed_url in RSS_FEEDS.items():
+    # Each worker thread downloads and parses its own feed, so parsing of one
+    # feed overlaps with the downloads (and parsing) of the others.  The Valor
+    # scrape runs alongside the feeds.
+    futures = {
+        feed_name: _run_in_daemon_thread(get_rss_articles, feed_name, feed_url)
+        for feed_name, feed_url in RSS_FEEDS.items()
+    }
+    futures["Valor"] = _run_in_daemon_thread(scrape_valor_headlines)
+    # Wait at most COLLECT_DEADLINE for the whole batch; whatever is still
+    # running is abandoned (its daemon thread dies with the process) instead
+    # of holding up the job or the process exit.
+    wait(futures.values(), timeout=COLLECT_DEADLINE)
+    for feed_name, future in futures.items():
+        if not future.done():
+            logging.warning(f"Skipping {feed_name}: no response within {COLLECT_DEADLINE:g}s")
+            continue
         try:
-            articles = get_rss_articles(feed_name, feed_url)
-            all_articles.extend(articles)
+            all_articles.extend(future.result())
         except Exception as exc:
             logging.error(f"Error fetching feed {feed_name}: {exc}")
-    valor_articles = scrape_valor_headlines()
-    all_articles.extend(valor_articles)
-    filtered = filter_today_articles(all_articles)
-    filtered.sort(key=lambda x: x.get("source", ""))
+    filtered = filter_today_articles(all_articles, today=today)
+    # The same story is often carried by several feeds (and by Valor); keep
+    # the first occurrence of each headline so it is only sent once.
+    seen_titles: set[str] = set()
+    unique: List[Dict[str, str]] = []
+    for art in filtered:
+        key = _title_key(art.get("title", ""))
+        if key:
+            if key in seen_titles:
+                continue
+            seen_titles.add(key)
+        unique.append(art)
+    filtered = _drop_already_sent(unique)
+    # Every article built by this module carries a "source" key.
+    filtered.sort(key=operator.itemgetter("source"))
     return filtered
 
 
+def _dispatch_message(topic: str, msg: str, content_sid: Optional[str], today_str: str) -> None:
+    """Send the daily message, via template when ``content_sid`` is set."""
+    if content_sid:
+        # Build variables: {1}=date, {2}=topic, {3}=message content
+        variables = {"1": today_str, "2": topic, "3": msg}
+        send_template_message(content_sid, variables)
+    else:
+        # Fall back to freeform message (only works within a 24h session)
+        send_whatsapp_message(msg)
+
+
+def _compose_digest(
+    sections: List[Tuple[str, List[Dict[str, str]]]],
+    today_str: str,
+    min_headlines: int,
+    limit: int = WHATSAPP_MAX_CHARS,
+) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+    """Join category headline sections into one message of at most ``limit`` chars.
+
+    While the message is too long, the last headline of the longest section
+    is dropped, as long as every section keeps ``min_headlines``.
+
+    Args:
+        sections: (category, articles) pairs, one per section.
+        today_str: Date shown in each section header.
+        min_headlines: Fewest headlines a section may be reduced to.
+        limit: Maximum message length.
+
+    Returns:
+        The message and the articles it contains, or ``None`` if it cannot
+        be made to fit.
+    """
+    counts = [len(arts) for _, arts in sections]
+    while True:
+        parts = [
+            build_headline_message(category=topic, articles=arts, max_articles=count, today_str=today_str)
+            for (topic, arts), count in zip(sections, counts)
+        ]
+        body = "\n\n---\n\n".join(parts)
+        if len(body) <= limit:
+            kept = [art for (_, arts), count in zip(sections, counts) for art in arts[:count]]
+            return body, kept
+        shrinkable = [i for i, count in enumerate(counts) if count > min_headlines]
+        if not shrinkable:
+            return None
+        counts[max(shrinkable, key=lambda i: len(parts[i]))] -= 1
+
+
 def daily_job(send_message: bool = False) -> None:
     """Collect, summarise and optionally send today's news.
 
@@ -521,75 +1144,64 @@ def daily_job(send_message: bool = False) -> None:
             only log the message (useful for development/testing).
     """
     logging.info("Starting daily news aggregation job")
-    articles = collect_today_news()
+    # Resolve the date once; every stage below filters and labels by it.
+    today = datetime.datetime.now(_LOCAL_TZ).date()
+    today_str = today.strftime("%d/%m/%Y")
+    articles = collect_today_news(today=today)
     if not articles:
         logging.warning("No articles found for today. Nothing to summarise.")
         return
-    # Break the articles into thematic categories and prepare two short messages,
-    # one for Política and one for Economia.  Each message includes only the
-    # main headlines (no summaries) to stay well below Twilio's character limit.
+    # Break the articles into thematic categories and prepare two short sections,
+    # one for Política and one for Economia, which are sent together.  Each
+    # section includes only the main headlines (no summaries) to keep the
+    # message short.
     categories = categorize_articles(articles)
-    # Build a list of (topic, message) tuples instead of plain strings to retain context.
-    messages: List[Tuple[str, str]] = []
-    for topic in ("Politica", "Economia"):
-        topic_articles = categories.get(topic, [])
-        if not topic_articles:
-            continue
-        try:
-            msg = build_headline_message(
-                category=topic,
-                articles=topic_articles,
-                tz="America/Sao_Paulo",
-                max_articles=5,
-            )
-        except Exception as exc:
-            logging.error(f"Failed to build headlines message for {topic}: {exc}")
-            continue
-        messages.append((topic, msg))
-    if not messages:
+    sections: List[Tuple[str, List[Dict[str, str]]]] = [
+        (topic, categories[topic][:5]) for topic in ("Politica", "Economia") if categories.get(topic)
+    ]
+    if not sections:
         logging.warning("No headlines messages to send after categorisation.")
         return
-    logging.info(f"Prepared {len(messages)} headline message(s) for dispatch.")
+    # Each outgoing message as (topics, body, articles it contains).  Normally
+    # all sections fit in one message once trailing headlines are trimmed;
+    # otherwise each category is sent on its own.
+    outgoing: List[Tuple[str, str, List[Dict[str, str]]]] = []
+    digest = _compose_digest(sections, today_str, min_headlines=3)
+    if digest is not None:
+        outgoing.append((" & ".join(topic for topic, _ in sections), *digest))
+    else:
+        logging.info("Headlines do not fit in one message; sending one per category.")
+        for topic, topic_articles in sections:
+            single = _compose_digest([(topic, topic_articles)], today_str, min_headlines=1)
+            if single is None:
+                logging.error(f"Headlines for {topic} do not fit in a WhatsApp message.")
+                continue
+            outgoing.append((topic, *single))
+    logging.info(f"Prepared {len(outgoing)} headline message(s) for dispatch.")
     if send_message:
         # Determine if a template SID is available; if so, send via template.
         content_sid = os.getenv("CONTENT_SID_DAILY")
-        # Compute today's date string for placeholder {1}
-        local_tz = pytz.timezone("America/Sao_Paulo")
-        today_str = datetime.datetime.now(local_tz).strftime("%d/%m/%Y")
-        for topic, msg in messages:
+        for topics, body, sent_articles in outgoing:
             try:
-                if content_sid:
-                    # Build variables: {1}=date, {2}=topic, {3}=message content
-                    variables = {"1": today_str, "2": topic, "3": msg}
-                    send_template_message(content_sid, variables)
-                else:
-                    # Fall back to freeform message (only works within a 24h session)
-                    send_whatsapp_message(msg)
-                time.sleep(1)
+                _dispatch_message(topics, body, content_sid, today_str)
             except Exception as exc:
-                logging.error(f"Failed to send WhatsApp message: {exc}")
+                logging.error(f"Failed to send WhatsApp message for {topics}: {exc}")
+                continue
+            _record_sent(sent_articles, today)
     else:
-        # Preview the prepared messages in the logs
-        for idx, (topic, msg) in enumerate(messages, start=1):
-            logging.info(f"Headline message {idx} for {topic} preview:\n{msg}\n")
-
-
-def schedule_daily_news(send_message: bool = False) -> None:
-    """Schedule the news job to run every day at 06:00 São Paulo time.
-
-    Args:
-        send_message: Whether to dispatch the message via WhatsApp.
-    """
-    def job_wrapper():
-        daily_job(send_message=send_message)
-    schedule.every().day.at("06:00").do(job_wrapper)
-    logging.info("Scheduled daily job at 06:00 America/Sao_Paulo.")
-    while True:
-        schedule.run_pending()
-        time.sleep(30)
+        # Preview exactly the messages that would be sent
+        for idx, (topics, body, _) in enumerate(outgoing, start=1):
+            logging.info(f"Headline message {idx} for {topics} preview:\n{body}\n")
 
 
 if __name__ == "__main__":
-    daily_job(send_message=False)
-    # To schedule automatically, uncomment the following line:
-    # schedule_daily_news(send_message=True)
\ No newline at end of file
+    # Run once and exit; recurring runs are scheduled externally (cron,
+    # systemd timer or the GitHub Actions workflow, see the module docstring).
+    parser = argparse.ArgumentParser(description="Collect today's news and send it via WhatsApp.")
+    parser.add_argument(
+        "--send",
+        action="store_true",
+        help="dispatch the messages through Twilio instead of only logging a preview",
+    )
+    args = parser.parse_args()
+    daily_job(send_message=args.send)